@@ -8,11 +8,12 @@ Data Sources: GEUS, USGS MRDS, Mining Company Filings
 """
 
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import io
+import base64
 from datetime import datetime
 
 # ============================================================================
@@ -51,8 +52,16 @@ COLORS = {
     'info': '#17A2B8',
 }
 
-# Custom CSS for professional styling - FIXED SIDEBAR
-st.markdown(f"""
+# ============================================================================
+# STATIC HTML - palette interpolated once per process, not on every rerun
+# ============================================================================
+
+@st.cache_resource
+def build_static_html():
+    """Build the CSS and fixed HTML fragments from the palette"""
+    return {
+        # Custom CSS for professional styling - FIXED SIDEBAR
+        'css': f"""
 <style>
     /* ===== SIDEBAR STYLING - MATCH MAIN APP ===== */
     [data-testid="stSidebar"] {{
@@ -97,20 +106,49 @@ st.markdown(f"""
         color: {COLORS['periwinkle_dark']};
     }}
     
-    /* Tabs styling */
-    .stTabs [data-baseweb="tab-list"] {{
+    /* KPI strip */
+    .kpi-row {{
+        display: flex;
+        gap: 16px;
+        margin-bottom: 1rem;
+    }}
+    
+    .kpi-card {{
+        flex: 1;
+        min-width: 0;
+    }}
+    
+    .kpi-label {{
+        font-size: 14px;
+        color: {COLORS['charcoal']};
+    }}
+    
+    .kpi-value {{
+        font-size: 28px;
+        color: {COLORS['periwinkle_dark']};
+        line-height: 1.4;
+    }}
+    
+    .kpi-delta {{
+        font-size: 14px;
+        color: {COLORS['success']};
+    }}
+    
+    /* View switcher styled as tabs */
+    .st-key-active_view [role="radiogroup"] {{
         gap: 8px;
         background-color: transparent;
     }}
     
-    .stTabs [data-baseweb="tab"] {{
+    .st-key-active_view [role="radiogroup"] > label {{
         background-color: {COLORS['grey_100']};
         border-radius: 4px 4px 0 0;
         padding: 10px 20px;
+        margin-right: 0;
         color: {COLORS['charcoal']};
     }}
     
-    .stTabs [aria-selected="true"] {{
+    .st-key-active_view [role="radiogroup"] > label:has(input:checked) {{
         background-color: {COLORS['periwinkle']} !important;
         color: white !important;
     }}
@@ -170,85 +208,689 @@ st.markdown(f"""
         border-color: {COLORS['grey_200']};
     }}
 </style>
-""", unsafe_allow_html=True)
+""",
+        'sidebar_brand': f"""
+    <div style="text-align: center; padding: 10px 0 20px 0;">
+        <div style="font-size: 40px;">🌍</div>
+        <div style="font-size: 14px; font-weight: bold; color: {COLORS['charcoal']};">REE Intelligence</div>
+    </div>
+    """,
+        'sidebar_headings': {
+            'score': f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">📊 STRATEGIC SCORE</p>',
+            'ownership': f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">🏛️ OWNERSHIP</p>',
+            'uranium': f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">☢️ URANIUM STATUS</p>',
+            'status': f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">⚙️ PROJECT STATUS</p>',
+            'export': f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 10px;">📥 EXPORT DATA</p>',
+        },
+        # Only the date is filled in per rerun
+        'sidebar_sources': f"""
+    <div style="text-align: center; padding: 10px 0;">
+        <p style="font-size: 10px; color: {COLORS['charcoal_light']}; margin: 0;">Data Sources</p>
+        <p style="font-size: 11px; color: {COLORS['charcoal']}; margin: 5px 0 0 0;"><strong>GEUS • USGS • SEC</strong></p>
+        <p style="font-size: 10px; color: {COLORS['charcoal_light']}; margin: 10px 0 0 0;">Updated: {{updated}}</p>
+    </div>
+    """,
+        'header_badge': f"""
+    <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 5px;">
+        <span style="background-color: {COLORS['periwinkle']}; color: white; padding: 4px 12px; border-radius: 12px; font-size: 10px; font-weight: bold; letter-spacing: 1px;">OPEN SOURCE INTELLIGENCE</span>
+    </div>
+    """,
+        # Values are formatted per rerun
+        'kpi_strip': """
+    <div class="kpi-row">
+        <div class="kpi-card"><div class="kpi-label">📍 Deposits</div><div class="kpi-value">{deposits}</div><div class="kpi-delta">↑ of {total} total</div></div>
+        <div class="kpi-card"><div class="kpi-label">⛏️ Total Resource</div><div class="kpi-value">{resource}</div></div>
+        <div class="kpi-card"><div class="kpi-label">💎 Contained TREO</div><div class="kpi-value">{treo}</div></div>
+        <div class="kpi-card"><div class="kpi-label">🔋 Avg Heavy REE</div><div class="kpi-value">{heavy}</div></div>
+        <div class="kpi-card"><div class="kpi-label">☢️ Uranium Blocked</div><div class="kpi-value">{blocked}</div></div>
+    </div>
+    """,
+        'key_finding': f"""
+    <div class="highlight-box">
+        <div style="font-size: 11px; font-weight: bold; color: {COLORS['periwinkle_dark']}; letter-spacing: 1px; margin-bottom: 8px;">KEY FINDING</div>
+        <p style="margin: 0; font-size: 15px; line-height: 1.6;">
+            <strong>Tanbreez</strong> (80/100) emerges as the most strategically valuable deposit for Western supply chain diversification. 
+            With 30% heavy REE content (highest globally), zero Chinese exposure, US corporate control via Critical Metals Corp (NASDAQ: CRML), 
+            and clear regulatory status, it represents the optimal balance of geological quality and geopolitical security.
+        </p>
+    </div>
+    """,
+    }
+
+HTML = build_static_html()
+st.markdown(HTML['css'], unsafe_allow_html=True)
 
 # ============================================================================
 # DATA LOADING
 # ============================================================================
 
-@st.cache_data
+OWNERSHIP_TYPES = ['Chinese Exposure', 'Western Control']
+URANIUM_STATUSES = ['Blocked (>100 ppm)', 'Clear (<100 ppm)']
+
+@st.cache_resource
 def load_data():
-    """Load and prepare the comprehensive REE deposits dataset"""
+    """Load and prepare the comprehensive REE deposits dataset (shared read-only, never mutate)"""
     
     data = {
-        'deposit_name': ['Tanbreez (Kringlerne)', 'Kvanefjeld', 'Sarfartoq', 'Motzfeldt', 
+        'deposit_name': pd.array(['Tanbreez (Kringlerne)', 'Kvanefjeld', 'Sarfartoq', 'Motzfeldt', 
                        'Ilímaussaq Complex', 'Tikiusaaq', 'Qeqertaasaq', 'Milne Land',
                        'Niaqornaarsuk', 'Qaqarssuk', 'Kangerlussuaq', 'Gardar South',
-                       'Narsaq Area', 'Ivigtut Area', 'Skaergaard'],
-        'latitude': [60.87, 60.98, 66.48, 61.17, 60.95, 64.22, 69.25, 70.75, 
-                    60.45, 66.12, 67.02, 60.75, 60.92, 61.20, 68.18],
-        'longitude': [-45.88, -45.92, -51.17, -45.08, -45.85, -51.95, -53.50, -26.50,
-                     -45.25, -52.75, -50.70, -46.00, -46.08, -48.17, -31.75],
-        'resource_mt': [4000, 1010, 8.6, 340, 500, 25, 15, 45, 120, 35, 75, 2000, 180, 50, 65],
-        'treo_grade_pct': [0.60, 1.10, 2.00, 0.25, 0.80, 1.50, 0.90, 0.65, 0.45, 1.80, 0.55, 0.70, 0.95, 0.30, 0.25],
-        'heavy_ree_pct': [30, 12, 15, 8, 18, 10, 12, 8, 14, 6, 9, 20, 11, 5, 7],
-        'owner': ['Critical Metals Corp', 'Energy Transition Minerals', 'Hudson Resources', 
+                       'Narsaq Area', 'Ivigtut Area', 'Skaergaard'], dtype='string[pyarrow]'),
+        'latitude': np.array([60.87, 60.98, 66.48, 61.17, 60.95, 64.22, 69.25, 70.75, 
+                    60.45, 66.12, 67.02, 60.75, 60.92, 61.20, 68.18], dtype=np.float64),
+        'longitude': np.array([-45.88, -45.92, -51.17, -45.08, -45.85, -51.95, -53.50, -26.50,
+                     -45.25, -52.75, -50.70, -46.00, -46.08, -48.17, -31.75], dtype=np.float64),
+        'resource_mt': np.array([4000, 1010, 8.6, 340, 500, 25, 15, 45, 120, 35, 75, 2000, 180, 50, 65], dtype=np.float64),
+        'treo_grade_pct': np.array([0.60, 1.10, 2.00, 0.25, 0.80, 1.50, 0.90, 0.65, 0.45, 1.80, 0.55, 0.70, 0.95, 0.30, 0.25], dtype=np.float64),
+        'heavy_ree_pct': np.array([30, 12, 15, 8, 18, 10, 12, 8, 14, 6, 9, 20, 11, 5, 7], dtype=np.int16),
+        'owner': pd.array(['Critical Metals Corp', 'Energy Transition Minerals', 'Hudson Resources', 
                  'Regency Mines', 'Various', 'Unlicensed', 'Unlicensed', 'GreenRock Resources',
                  'Tanbreez Mining', 'NunaMinerals', 'Government', 
-                 'Multiple', 'ETM', 'Historical', 'Platina Resources'],
-        'chinese_stake_pct': [0, 9.21, 0, 0, 5, 0, 0, 0, 0, 0, 0, 3, 9.21, 0, 0],
-        'status': ['Advancing', 'Blocked', 'Permitted', 'Exploration', 'Multiple', 
+                 'Multiple', 'ETM', 'Historical', 'Platina Resources'], dtype='category'),
+        'chinese_stake_pct': np.array([0, 9.21, 0, 0, 5, 0, 0, 0, 0, 0, 0, 3, 9.21, 0, 0], dtype=np.float64),
+        'status': pd.array(['Advancing', 'Blocked', 'Permitted', 'Exploration', 'Multiple', 
                   'Prospect', 'Prospect', 'Exploration', 'Exploration', 'Abandoned',
-                  'Reserved', 'Multiple', 'Uncertain', 'Closed', 'PGE Focus'],
-        'uranium_ppm': [15, 285, 45, 60, 120, 30, 25, 40, 55, 20, 35, 150, 220, 15, 10],
-        'strategic_score': [80.0, 52.0, 61.0, 48.0, 58.0, 42.0, 35.0, 40.0, 55.0, 38.0, 45.0, 62.0, 48.0, 25.0, 32.0],
+                  'Reserved', 'Multiple', 'Uncertain', 'Closed', 'PGE Focus'], dtype='category'),
+        'uranium_ppm': np.array([15, 285, 45, 60, 120, 30, 25, 40, 55, 20, 35, 150, 220, 15, 10], dtype=np.int16),
+        'strategic_score': np.array([80.0, 52.0, 61.0, 48.0, 58.0, 42.0, 35.0, 40.0, 55.0, 38.0, 45.0, 62.0, 48.0, 25.0, 32.0], dtype=np.float64),
         # Five-lens scores
-        'geological_score': [85, 90, 70, 55, 75, 60, 50, 45, 65, 55, 50, 70, 60, 30, 40],
-        'regulatory_score': [90, 20, 75, 60, 50, 70, 70, 65, 70, 50, 40, 45, 30, 80, 75],
-        'ownership_score': [95, 50, 85, 80, 60, 90, 90, 85, 85, 80, 70, 65, 50, 85, 80],
-        'infrastructure_score': [60, 65, 40, 55, 60, 30, 20, 25, 50, 35, 45, 70, 55, 60, 35],
-        'geopolitical_score': [70, 55, 50, 40, 55, 35, 30, 40, 45, 30, 50, 60, 50, 20, 25],
+        'geological_score': np.array([85, 90, 70, 55, 75, 60, 50, 45, 65, 55, 50, 70, 60, 30, 40], dtype=np.int16),
+        'regulatory_score': np.array([90, 20, 75, 60, 50, 70, 70, 65, 70, 50, 40, 45, 30, 80, 75], dtype=np.int16),
+        'ownership_score': np.array([95, 50, 85, 80, 60, 90, 90, 85, 85, 80, 70, 65, 50, 85, 80], dtype=np.int16),
+        'infrastructure_score': np.array([60, 65, 40, 55, 60, 30, 20, 25, 50, 35, 45, 70, 55, 60, 35], dtype=np.int16),
+        'geopolitical_score': np.array([70, 55, 50, 40, 55, 35, 30, 40, 45, 30, 50, 60, 50, 20, 25], dtype=np.int16),
         # Additional metadata
-        'discovery_year': [2007, 1956, 1995, 1962, 1806, 2010, 2015, 2008, 2005, 1990, 2000, 1960, 1960, 1806, 1930],
-        'ice_free_months': [4, 4, 3, 4, 4, 3, 2, 2, 4, 3, 3, 4, 4, 4, 2],
-        'port_distance_km': [15, 12, 180, 25, 15, 200, 350, 400, 20, 150, 120, 18, 15, 30, 280],
+        'discovery_year': np.array([2007, 1956, 1995, 1962, 1806, 2010, 2015, 2008, 2005, 1990, 2000, 1960, 1960, 1806, 1930], dtype=np.int16),
+        'ice_free_months': np.array([4, 4, 3, 4, 4, 3, 2, 2, 4, 3, 3, 4, 4, 4, 2], dtype=np.int16),
+        'port_distance_km': np.array([15, 12, 180, 25, 15, 200, 350, 400, 20, 150, 120, 18, 15, 30, 280], dtype=np.int16),
     }
     
     df = pd.DataFrame(data)
     
-    # Derived columns
-    df['ownership_type'] = df['chinese_stake_pct'].apply(
-        lambda x: 'Chinese Exposure' if x > 0 else 'Western Control'
-    )
-    df['uranium_status'] = df['uranium_ppm'].apply(
-        lambda x: 'Blocked (>100 ppm)' if x > 100 else 'Clear (<100 ppm)'
-    )
-    df['score_category'] = pd.cut(
-        df['strategic_score'], 
-        bins=[0, 40, 60, 80, 100], 
-        labels=['Low', 'Medium', 'High', 'Very High']
-    )
-    df['contained_treo_kt'] = (df['resource_mt'] * df['treo_grade_pct'] / 100 * 1000).round(0)
-    df['contained_hree_kt'] = (df['contained_treo_kt'] * df['heavy_ree_pct'] / 100).round(0)
+    # Derived columns; underscore-prefixed flags are internal (hidden from the explorer and exports)
+    df['_chinese_exposed'] = df['chinese_stake_pct'].to_numpy() > 0
+    df['_u_blocked'] = df['uranium_ppm'].to_numpy() > 100
+    df['ownership_type'] = pd.Categorical(np.where(
+        df['_chinese_exposed'].to_numpy(), 'Chinese Exposure', 'Western Control'
+    ), categories=OWNERSHIP_TYPES)
+    df['uranium_status'] = pd.Categorical(np.where(
+        df['_u_blocked'].to_numpy(), 'Blocked (>100 ppm)', 'Clear (<100 ppm)'
+    ), categories=URANIUM_STATUSES)
+    # right=True keeps pd.cut's right-closed bins: (0,40] Low, (40,60] Medium, ...
+    score_labels = np.array(['Low', 'Medium', 'High', 'Very High'])
+    score_bins = np.digitize(df['strategic_score'].to_numpy(), np.array([40, 60, 80]), right=True)
+    df['score_category'] = pd.Categorical(score_labels[score_bins], categories=score_labels, ordered=True)
+    resource = df['resource_mt'].to_numpy()
+    grade = df['treo_grade_pct'].to_numpy()
+    hree = df['heavy_ree_pct'].to_numpy()
+    treo = np.rint(resource * grade * 10.0)  # Mt * % / 100 * 1000 == Mt * % * 10
+    df['contained_treo_kt'] = treo
+    df['contained_hree_kt'] = np.rint(treo * hree * 0.01)
+    
+    # Arrow-backed numeric columns so st.dataframe and the exports skip the NumPy -> Arrow copy
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    df = df.astype({col: pd.ArrowDtype(pa.from_numpy_dtype(df[col].dtype)) for col in numeric_cols})
     
     return df
 
+def filter_arrays():
+    """Filter columns as raw NumPy arrays / category codes, extracted once per session"""
+    if 'masks' not in st.session_state:
+        df = load_data()
+        st.session_state.masks = {
+            'score': df['strategic_score'].to_numpy(),
+            'ownership': df['ownership_type'].array,
+            'uranium': df['uranium_status'].array,
+            'status': df['status'].array,
+        }
+    return st.session_state.masks
+
+def lens_index():
+    """Five-lens scores as a (deposit x lens) matrix plus a name -> row map, built once per session"""
+    if 'lens' not in st.session_state:
+        df = load_data()
+        st.session_state.lens = (
+            np.ascontiguousarray(df[['geological_score', 'regulatory_score', 'ownership_score',
+                                     'infrastructure_score', 'geopolitical_score']].to_numpy(dtype=np.int16)),
+            {name: i for i, name in enumerate(df['deposit_name'])},
+        )
+    return st.session_state.lens
+
+def isin_codes(categorical, selected):
+    """Boolean mask of rows whose label is in `selected`, compared on integer category codes"""
+    selected_codes = categorical.categories.get_indexer(selected)
+    return np.isin(categorical.codes, selected_codes[selected_codes >= 0])
+
+def filter_rows(filter_key):
+    """Boolean row mask for a (score_range, ownership, uranium, status) filter signature"""
+    score_range, ownership, uranium, status = filter_key
+    masks = filter_arrays()
+    score_values = masks['score']
+    return (
+        (score_values >= score_range[0]) &
+        (score_values <= score_range[1]) &
+        isin_codes(masks['ownership'], ownership) &
+        isin_codes(masks['uranium'], uranium) &
+        isin_codes(masks['status'], status)
+    )
+
+def filter_deposits(filter_key):
+    """Apply a (score_range, ownership, uranium, status) filter signature to the dataset"""
+    # Label columns are already categoricals from load_data
+    return load_data().iloc[filter_rows(filter_key)].reset_index(drop=True).copy()
+
 # Load data
 df = load_data()
+N_DEPOSITS = len(df)
+
+# ============================================================================
+# FIGURE BUILDERS - cached per filter signature, returned as shared go.Figure objects
+# ============================================================================
+
+# Above this many deposits the map is rasterized with Datashader instead of drawn per point
+DATASHADER_THRESHOLD = 5_000
+# Builders return the go.Figure itself from st.cache_resource: st.plotly_chart only reads it,
+# and a dict spec would be rebuilt and re-validated as a Figure on every render
+FIGURE_CACHE_SIZE = 32
+
+# Static layouts, built once and handed to go.Figure(layout=...) - extend copies, never mutate
+GRID_AXIS = dict(gridcolor=COLORS['grey_200'])
+# Fixed 0-100 score domain: explicit ticks, no pan/zoom
+SCORE_AXIS = dict(title='Strategic Score', range=[0, 100], tickvals=[0, 20, 40, 60, 80, 100], fixedrange=True)
+UNTITLED_AXIS = dict(title='')
+LEGEND_TOP = dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
+# Shared by every cartesian chart; composed into the per-chart layouts below
+BASE_LAYOUT = dict(plot_bgcolor='white', margin={"r":10,"t":10,"l":10,"b":40})
+LAYOUT_CHART_SM = dict(BASE_LAYOUT, height=350)
+
+LAYOUT_MAP = dict(
+    mapbox=dict(style='carto-positron', zoom=2.3, center={'lat': 68, 'lon': -42}),
+    margin={"r":0,"t":0,"l":0,"b":0},
+    height=500,
+)
+LAYOUT_RANKING = dict(
+    BASE_LAYOUT,
+    xaxis=dict(GRID_AXIS, **SCORE_AXIS),
+    yaxis=UNTITLED_AXIS,
+    margin={"r":60,"t":10,"l":10,"b":40},
+    height=500,
+)
+LAYOUT_MATRIX = dict(
+    LAYOUT_CHART_SM,
+    xaxis=dict(GRID_AXIS, type='log', title='Resource (Mt, log scale)'),
+    yaxis=dict(GRID_AXIS, title='Grade (% TREO)'),
+    legend=dict(LEGEND_TOP, itemsizing='constant'),
+)
+LAYOUT_PIE = dict(
+    margin={"r":10,"t":10,"l":10,"b":10},
+    height=350,
+    showlegend=True,
+    legend=dict(orientation='h', yanchor='bottom', y=-0.15, xanchor='center', x=0.5),
+)
+LAYOUT_URANIUM = dict(
+    LAYOUT_CHART_SM,
+    xaxis=UNTITLED_AXIS,
+    yaxis=dict(GRID_AXIS, title='Deposits'),
+    hovermode=False,
+    transition=dict(duration=0),
+)
+LAYOUT_RADAR = dict(
+    polar=dict(
+        radialaxis=dict(visible=True, range=[0, 100], tickfont=dict(size=9)),
+        angularaxis=dict(tickfont=dict(size=11))
+    ),
+    margin={"r":30,"t":30,"l":30,"b":30},
+    height=400,
+)
+LAYOUT_SCENARIO = dict(
+    BASE_LAYOUT,
+    xaxis=SCORE_AXIS,
+    yaxis=UNTITLED_AXIS,
+    margin={"r":20,"t":10,"l":10,"b":40},
+    height=450,
+    legend=LEGEND_TOP,
+)
+
+# Plotly config: 1x WebGL backing store instead of device-pixel-ratio sized
+PLOTLY_CONFIG = dict(plotGlPixelRatio=1, doubleClickDelay=1000)
+# Charts whose labels already show every value skip event listeners entirely
+PLOTLY_CONFIG_STATIC = dict(PLOTLY_CONFIG, staticPlot=True)
+
+def render_figure(fig, config=PLOTLY_CONFIG):
+    """Draw a cached figure full-width (shared object - never mutate)"""
+    st.plotly_chart(fig, use_container_width=True, config=config)
+
+def datashader_layer(filtered_df):
+    """Rasterize deposits (mean strategic score per pixel) into a Mapbox image layer, or None without datashader"""
+    try:
+        import datashader as ds  # optional dependency, only needed for large datasets
+        from datashader.utils import lnglat_to_meters
+    except ImportError:
+        return None
+    
+    # Mapbox places image layers in Web Mercator, so bin in metres rather than degrees
+    lon = filtered_df['longitude'].to_numpy(dtype=np.float64)
+    lat = filtered_df['latitude'].to_numpy(dtype=np.float64)
+    x, y = lnglat_to_meters(lon, lat)
+    points = pd.DataFrame({'x': x, 'y': y, 'score': filtered_df['strategic_score'].to_numpy(dtype=np.float64)})
+    x_range = (float(x.min()), float(x.max()))
+    y_range = (float(y.min()), float(y.max()))
+    
+    cvs = ds.Canvas(plot_width=900, plot_height=600, x_range=x_range, y_range=y_range)
+    agg = cvs.points(points, 'x', 'y', ds.mean('score'))
+    img = ds.tf.shade(agg, cmap=[COLORS['periwinkle_light'], COLORS['periwinkle_dark']])
+    
+    buffer = io.BytesIO()
+    img.to_pil().save(buffer, format='PNG')
+    # Mercator is monotonic per axis, so the metre extent maps back to the lon/lat extent
+    west, east = float(lon.min()), float(lon.max())
+    south, north = float(lat.min()), float(lat.max())
+    return dict(
+        sourcetype='image',
+        source='data:image/png;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii'),
+        # Corners: top-left, top-right, bottom-right, bottom-left
+        coordinates=[
+            [west, north],
+            [east, north],
+            [east, south],
+            [west, south],
+        ],
+    )
+
+@st.cache_resource
+def map_hover_data():
+    """Map hover fields not already carried by marker size/color, built once (shared read-only, never mutate)"""
+    df = load_data()
+    return np.stack([
+        df['heavy_ree_pct'].to_numpy(),
+        df['owner'].to_numpy(),
+        df['status'].to_numpy(),
+    ], axis=-1)
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_map_fig(filter_key):
+    """Strategic deposit map"""
+    import plotly.graph_objects as go  # deferred: keeps Plotly off the cold-start path
+    filtered_df = filter_deposits(filter_key)
+    
+    # Large selections are rasterized; without datashader they fall back to the point map
+    density_layer = datashader_layer(filtered_df) if len(filtered_df) > DATASHADER_THRESHOLD else None
+    if density_layer is not None:
+        fig_map = go.Figure(
+            data=[go.Scattermapbox(lat=[], lon=[], mode='markers')],
+            layout=dict(LAYOUT_MAP, mapbox=dict(LAYOUT_MAP['mapbox'], layers=[density_layer]))
+        )
+        return fig_map
+    
+    resource = filtered_df['resource_mt'].to_numpy()
+    
+    fig_map = go.Figure(data=[go.Scattermapbox(
+        lat=filtered_df['latitude'].to_numpy(),
+        lon=filtered_df['longitude'].to_numpy(),
+        mode='markers',
+        marker=dict(
+            size=resource,
+            sizemode='area',
+            sizeref=resource.max() / 50 ** 2 if len(resource) else 1,
+            color=filtered_df['strategic_score'].to_numpy(),
+            colorscale=[
+                [0, COLORS['grey_300']],
+                [0.4, COLORS['periwinkle_light']],
+                [0.7, COLORS['periwinkle']],
+                [1, COLORS['periwinkle_dark']]
+            ],
+            showscale=True,
+            colorbar=dict(title=dict(text="Score")),
+        ),
+        hovertext=filtered_df['deposit_name'].to_numpy(),
+        customdata=map_hover_data()[filter_rows(filter_key)],
+        hovertemplate=(
+            "<b>%{hovertext}</b><br><br>"
+            "Resource: %{marker.size:,.0f} Mt<br>"
+            "Score: %{marker.color:.0f}<br>"
+            "Heavy REE: %{customdata[0]:.0f}%<br>"
+            "Owner: %{customdata[1]}<br>"
+            "Status: %{customdata[2]}<extra></extra>"
+        ),
+    )], layout=LAYOUT_MAP)
+    
+    return fig_map
+
+@st.cache_resource
+def score_order():
+    """Full-dataset row order by ascending strategic score (stable), built once"""
+    return np.argsort(load_data()['strategic_score'].to_numpy(), kind='stable')
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_ranking_fig(filter_key):
+    """Horizontal strategic ranking bars, colored by score band"""
+    import plotly.graph_objects as go
+    # Filtering keeps relative order, so the precomputed full ranking restricted to the mask is the filtered ranking
+    order = score_order()
+    rows = order[filter_rows(filter_key)[order]]
+    data = load_data()
+    
+    # Color bars by score category
+    scores = data['strategic_score'].to_numpy()[rows]
+    colors = np.select(
+        [scores >= 70, scores >= 50],
+        [COLORS['success'], COLORS['periwinkle']],
+        default=COLORS['grey_300']
+    ).tolist()
+    
+    fig_ranking = go.Figure(data=[go.Bar(
+        y=data['deposit_name'].to_numpy()[rows],
+        x=scores,
+        orientation='h',
+        marker_color=colors,
+        text=np.char.mod('%.0f', scores).tolist(),
+        textposition='outside',
+        textfont=dict(size=11),
+        hovertemplate="<b>%{y}</b><br>Score: %{x:.1f}<br>Owner: %{customdata}<extra></extra>",
+        customdata=data['owner'].to_numpy()[rows]
+    )], layout=LAYOUT_RANKING)
+    
+    # Add threshold lines
+    fig_ranking.add_vline(x=50, line_dash="dash", line_color=COLORS['warning'], line_width=1)
+    fig_ranking.add_vline(x=70, line_dash="dash", line_color=COLORS['success'], line_width=1)
+    
+    return fig_ranking
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_matrix_fig(filter_key):
+    """Resource size vs grade bubble chart, split by ownership"""
+    import plotly.graph_objects as go
+    filtered_df = filter_deposits(filter_key)
+    
+    resource = filtered_df['resource_mt'].to_numpy()
+    grade = filtered_df['treo_grade_pct'].to_numpy()
+    heavy = filtered_df['heavy_ree_pct'].to_numpy()
+    names = filtered_df['deposit_name'].to_numpy()
+    customdata = np.stack([
+        filtered_df['strategic_score'].to_numpy(),
+        filtered_df['owner'].to_numpy(),
+        filtered_df['status'].to_numpy(),
+    ], axis=-1)
+    chinese_mask = filtered_df['_chinese_exposed'].to_numpy()
+    sizeref = heavy.max() / 45 ** 2 if len(heavy) else 1
+    
+    fig_matrix = go.Figure(layout=LAYOUT_MATRIX)
+    
+    # One WebGL trace per ownership group
+    for label, group_mask, color in [
+        ('Western Control', ~chinese_mask, COLORS['periwinkle']),
+        ('Chinese Exposure', chinese_mask, COLORS['danger']),
+    ]:
+        fig_matrix.add_trace(go.Scattergl(
+            x=resource[group_mask],
+            y=grade[group_mask],
+            mode='markers',
+            name=label,
+            marker=dict(size=heavy[group_mask], sizemode='area', sizeref=sizeref, color=color),
+            hovertext=names[group_mask],
+            customdata=customdata[group_mask],
+            hovertemplate=(
+                "<b>%{hovertext}</b><br><br>"
+                "Resource: %{x:,.0f} Mt<br>"
+                "Grade: %{y:.2f}%<br>"
+                "Heavy REE: %{marker.size:.0f}%<br>"
+                "Score: %{customdata[0]:.0f}<br>"
+                "Owner: %{customdata[1]}<br>"
+                "Status: %{customdata[2]}<extra></extra>"
+            ),
+        ))
+    
+    # Add quadrant labels
+    fig_matrix.add_annotation(x=3.5, y=1.8, text="HIGH VALUE", showarrow=False, 
+                              font=dict(size=10, color=COLORS['charcoal_light']))
+    fig_matrix.add_annotation(x=1.2, y=0.4, text="LOW VALUE", showarrow=False,
+                              font=dict(size=10, color=COLORS['charcoal_light']))
+    
+    return fig_matrix
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_pie_fig(filter_key):
+    """Western vs Chinese-exposed share of total resource"""
+    import plotly.graph_objects as go
+    data = load_data()
+    rows = filter_rows(filter_key)
+    
+    # One weighted bincount over the exposure flag: [western, chinese] resource sums
+    western, chinese = np.bincount(
+        data['_chinese_exposed'].to_numpy()[rows],
+        weights=data['resource_mt'].to_numpy()[rows],
+        minlength=2,
+    )
+    
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=['Western Control', 'Chinese Exposure'],
+        values=[western, chinese],
+        hole=0.65,
+        marker_colors=[COLORS['periwinkle'], COLORS['danger']],
+        textinfo='percent',
+        textfont=dict(size=12),
+        hovertemplate="<b>%{label}</b><br>%{value:,.0f} Mt<br>%{percent}<extra></extra>"
+    )], layout=LAYOUT_PIE)
+    
+    fig_pie.add_annotation(
+        text=f"{western/(western+chinese+0.001)*100:.0f}%<br><span style='font-size:10px'>Western</span>",
+        x=0.5, y=0.5, showarrow=False,
+        font=dict(size=18, color=COLORS['charcoal'])
+    )
+    
+    return fig_pie
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_uranium_fig(filter_key):
+    """Deposit counts by uranium ban status"""
+    import plotly.graph_objects as go
+    codes = load_data()['uranium_status'].array.codes[filter_rows(filter_key)]
+    
+    # Category counts in value_counts order (descending, ties by category), empty bars dropped
+    counts = np.bincount(codes, minlength=len(URANIUM_STATUSES))
+    order = np.argsort(-counts, kind='stable')
+    order = order[counts[order] > 0]
+    labels = np.array(URANIUM_STATUSES)[order]
+    
+    fig_uranium = go.Figure(data=[go.Bar(
+        x=labels,
+        y=counts[order],
+        marker_color=np.where(np.char.startswith(labels, 'Clear'), COLORS['success'], COLORS['danger']),
+        text=counts[order].tolist(),
+        textposition='outside',
+        textfont=dict(size=14),
+    )], layout=LAYOUT_URANIUM)
+    
+    return fig_uranium
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_radar_fig(selected_deposit, primary_scores, compare_deposit, compare_scores):
+    """Five-lens radar for the selected deposit, optionally overlaid with a comparison"""
+    import plotly.graph_objects as go
+    categories = ['Geological', 'Regulatory', 'Ownership', 'Infrastructure', 'Geopolitical']
+    
+    fig_radar = go.Figure(layout=dict(LAYOUT_RADAR, showlegend=compare_deposit != 'None'))
+    
+    # Primary deposit
+    values_primary = list(primary_scores + primary_scores[:1])  # Close the polygon
+    
+    fig_radar.add_trace(go.Scatterpolar(
+        r=values_primary,
+        theta=categories + [categories[0]],
+        fill='toself',
+        fillcolor=f"rgba(142, 159, 213, 0.3)",
+        line_color=COLORS['periwinkle'],
+        name=selected_deposit
+    ))
+    
+    # Comparison deposit
+    if compare_deposit != 'None':
+        values_compare = list(compare_scores + compare_scores[:1])
+        
+        fig_radar.add_trace(go.Scatterpolar(
+            r=values_compare,
+            theta=categories + [categories[0]],
+            fill='toself',
+            fillcolor=f"rgba(220, 53, 69, 0.2)",
+            line_color=COLORS['danger'],
+            name=compare_deposit
+        ))
+    
+    return fig_radar
+
+# Fields read by build_specs_table, in unpacking order
+SPEC_FIELDS = ('resource_mt', 'treo_grade_pct', 'heavy_ree_pct', 'contained_treo_kt', 'contained_hree_kt',
+               'uranium_ppm', 'ice_free_months', 'port_distance_km', 'discovery_year')
+
+@st.cache_data
+def build_specs_table(spec_values):
+    """Formatted specification table for one deposit, keyed on its SPEC_FIELDS values"""
+    (resource_mt, treo_grade_pct, heavy_ree_pct, contained_treo_kt, contained_hree_kt,
+     uranium_ppm, ice_free_months, port_distance_km, discovery_year) = spec_values
+    
+    return pd.DataFrame({
+        'Metric': [
+            'Resource Estimate',
+            'TREO Grade',
+            'Heavy REE Content',
+            'Contained TREO',
+            'Contained Heavy REE',
+            'Uranium Content',
+            'Ice-Free Season',
+            'Port Distance',
+            'Discovery Year'
+        ],
+        'Value': [
+            f"{resource_mt:,.0f} Mt",
+            f"{treo_grade_pct:.2f}%",
+            f"{heavy_ree_pct:.0f}%",
+            f"{contained_treo_kt:,.0f} kt",
+            f"{contained_hree_kt:,.0f} kt",
+            f"{uranium_ppm:.0f} ppm {'⚠️' if uranium_ppm > 100 else '✅'}",
+            f"{ice_free_months} months",
+            f"{port_distance_km} km",
+            str(discovery_year)
+        ]
+    })
+
+@st.cache_data
+def build_display_table(filter_key, display_columns, sort_col, ascending):
+    """Data explorer frame: selected columns in stable sort order, one take per column"""
+    filtered_df = filter_deposits(filter_key)
+    order = filtered_df[sort_col].array.argsort(ascending=ascending, kind='stable')
+    return pd.DataFrame({col: filtered_df[col].array.take(order) for col in display_columns})
+
+SUMMARY_STATS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+@st.cache_data
+def build_summary_table(filter_key, summary_cols):
+    """describe()-equivalent summary of the filtered numeric columns, from one NumPy array"""
+    values = filter_deposits(filter_key)[list(summary_cols)].to_numpy(dtype=np.float64)
+    n_rows, n_cols = values.shape
+    stats = np.full((len(SUMMARY_STATS), n_cols), np.nan)
+    stats[0] = n_rows
+    if n_rows:
+        stats[1] = values.mean(axis=0)
+        if n_rows > 1:
+            stats[2] = values.std(axis=0, ddof=1)
+        stats[3] = values.min(axis=0)
+        stats[4:7] = np.percentile(values, [25, 50, 75], axis=0)
+        stats[7] = values.max(axis=0)
+    return pd.DataFrame(np.round(stats, 2), index=SUMMARY_STATS, columns=list(summary_cols))
+
+# ============================================================================
+# SCENARIO MODEL
+# ============================================================================
+
+@st.cache_data
+def compute_scenario(filter_key, uranium_scenario, chinese_scenario, infra_boost):
+    """Scenario-adjusted scores for the filtered deposits (only the columns the model changes)"""
+    filtered_df = filter_deposits(filter_key)
+    score_cols = ['regulatory_score', 'ownership_score', 'infrastructure_score', 'geopolitical_score', 'strategic_score']
+    REG, OWN, INFRA, GEO, STRAT = range(len(score_cols))
+    
+    scores = filtered_df[score_cols].to_numpy(dtype=np.float64, copy=True)
+    deltas = np.zeros_like(scores)
+    chinese_mask = filtered_df['_chinese_exposed'].to_numpy()
+    
+    # Uranium ban impact
+    if uranium_scenario == 'Ban Lifted':
+        blocked = filtered_df['_u_blocked'].to_numpy()
+        deltas[blocked, REG] += 40
+        deltas[blocked, STRAT] += 15
+    elif uranium_scenario == 'Stricter Limits (50 ppm)':
+        blocked = filtered_df['uranium_ppm'].to_numpy() > 50
+        deltas[blocked, REG] -= 30
+        deltas[blocked, STRAT] -= 10
+    
+    # Chinese investment impact
+    if chinese_scenario == 'Complete Ban':
+        deltas[chinese_mask, OWN] -= 20
+        deltas[chinese_mask, STRAT] -= 8
+    elif chinese_scenario == 'Restrictions Relaxed':
+        deltas[:, GEO] -= 10
+    
+    # Infrastructure boost
+    if infra_boost > 0:
+        infra_impact = min(infra_boost * 3, 20)
+        deltas[:, INFRA] += infra_impact
+        deltas[:, STRAT] += infra_impact * 0.15
+    
+    # Apply all adjustments at once, capping scores to 0-100
+    scores += deltas
+    np.clip(scores, 0, 100, out=scores)
+    
+    scenario_df = pd.DataFrame(scores, columns=score_cols)
+    scenario_df.insert(0, 'deposit_name', filtered_df['deposit_name'].to_numpy())
+    scenario_df['score_change'] = scores[:, STRAT] - filtered_df['strategic_score'].to_numpy()
+    
+    return scenario_df
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def build_scenario_fig(filter_key, uranium_scenario, chinese_scenario, infra_boost):
+    """Baseline ticks with diverging bars to the scenario strategic score"""
+    import plotly.graph_objects as go
+    filtered_df = filter_deposits(filter_key)
+    scenario_df = compute_scenario(filter_key, uranium_scenario, chinese_scenario, infra_boost)
+    
+    # Rows ordered by baseline score; each bar spans baseline -> scenario
+    order = np.argsort(filtered_df['strategic_score'].to_numpy(), kind='stable')
+    names = filtered_df['deposit_name'].to_numpy()[order]
+    baseline = filtered_df['strategic_score'].to_numpy()[order]
+    scenario = scenario_df['strategic_score'].to_numpy()[order]
+    change = scenario - baseline
+    
+    fig_scenario = go.Figure(data=[
+        go.Bar(
+            y=names,
+            x=change,
+            base=baseline,
+            orientation='h',
+            name='Scenario Change',
+            marker_color=np.where(change >= 0, COLORS['success'], COLORS['danger']),
+            customdata=scenario,
+            hovertemplate="<b>%{y}</b><br>Scenario: %{customdata:.0f} (%{x:+.1f})<extra></extra>",
+        ),
+        go.Scatter(
+            y=names,
+            x=baseline,
+            mode='markers',
+            name='Baseline',
+            marker=dict(symbol='line-ns', size=14, line=dict(width=2, color=COLORS['charcoal'])),
+            hovertemplate="<b>%{y}</b><br>Baseline: %{x:.0f}<extra></extra>",
+        ),
+    ], layout=LAYOUT_SCENARIO)
+    
+    return fig_scenario
 
 # ============================================================================
 # SIDEBAR - FILTERS & CONTROLS
 # ============================================================================
 
 with st.sidebar:
-    st.markdown(f"""
-    <div style="text-align: center; padding: 10px 0 20px 0;">
-        <div style="font-size: 40px;">🌍</div>
-        <div style="font-size: 14px; font-weight: bold; color: {COLORS['charcoal']};">REE Intelligence</div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HTML['sidebar_brand'], unsafe_allow_html=True)
     
-    st.markdown(f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">📊 STRATEGIC SCORE</p>', unsafe_allow_html=True)
+    st.markdown(HTML['sidebar_headings']['score'], unsafe_allow_html=True)
     score_range = st.slider(
         "Filter by score range",
         min_value=0,
@@ -260,7 +902,7 @@ with st.sidebar:
     
     st.markdown("")
     
-    st.markdown(f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">🏛️ OWNERSHIP</p>', unsafe_allow_html=True)
+    st.markdown(HTML['sidebar_headings']['ownership'], unsafe_allow_html=True)
     ownership_filter = st.multiselect(
         "Filter by ownership",
         options=['Western Control', 'Chinese Exposure'],
@@ -270,7 +912,7 @@ with st.sidebar:
     
     st.markdown("")
     
-    st.markdown(f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">☢️ URANIUM STATUS</p>', unsafe_allow_html=True)
+    st.markdown(HTML['sidebar_headings']['uranium'], unsafe_allow_html=True)
     uranium_filter = st.multiselect(
         "Uranium ban impact",
         options=['Clear (<100 ppm)', 'Blocked (>100 ppm)'],
@@ -280,7 +922,7 @@ with st.sidebar:
     
     st.markdown("")
     
-    st.markdown(f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 5px;">⚙️ PROJECT STATUS</p>', unsafe_allow_html=True)
+    st.markdown(HTML['sidebar_headings']['status'], unsafe_allow_html=True)
     status_options = df['status'].unique().tolist()
     status_filter = st.multiselect(
         "Project status",
@@ -292,52 +934,76 @@ with st.sidebar:
     st.markdown("---")
     
     # Export
-    st.markdown(f'<p style="font-size: 13px; font-weight: bold; color: {COLORS["charcoal"]}; margin-bottom: 10px;">📥 EXPORT DATA</p>', unsafe_allow_html=True)
+    st.markdown(HTML['sidebar_headings']['export'], unsafe_allow_html=True)
     
     @st.cache_data
     def convert_df_to_csv(dataframe):
-        return dataframe.to_csv(index=False).encode('utf-8')
+        # Arrow's multithreaded C++ writer instead of pandas' per-cell formatter
+        buffer = io.BytesIO()
+        pa_csv.write_csv(pa.Table.from_pandas(dataframe, preserve_index=False), buffer)
+        return buffer.getvalue()
     
-    csv_data = convert_df_to_csv(df)
+    @st.cache_data
+    def convert_df_to_parquet(dataframe):
+        buffer = io.BytesIO()
+        dataframe.to_parquet(buffer, engine='pyarrow', compression='zstd', index=False)
+        return buffer.getvalue()
+    
+    export_stamp = datetime.now().strftime('%Y%m%d')
+    export_df = df[[col for col in df.columns if not col.startswith('_')]]
+    csv_data = convert_df_to_csv(export_df)
     st.download_button(
         label="Download CSV",
         data=csv_data,
-        file_name=f"greenland_ree_{datetime.now().strftime('%Y%m%d')}.csv",
+        file_name=f"greenland_ree_{export_stamp}.csv",
         mime="text/csv",
         use_container_width=True
     )
     
+    parquet_data = convert_df_to_parquet(export_df)
+    st.download_button(
+        label="Download Parquet",
+        data=parquet_data,
+        file_name=f"greenland_ree_{export_stamp}.parquet",
+        mime="application/vnd.apache.parquet",
+        use_container_width=True
+    )
+    
     st.markdown("---")
     
-    st.markdown(f"""
-    <div style="text-align: center; padding: 10px 0;">
-        <p style="font-size: 10px; color: {COLORS['charcoal_light']}; margin: 0;">Data Sources</p>
-        <p style="font-size: 11px; color: {COLORS['charcoal']}; margin: 5px 0 0 0;"><strong>GEUS • USGS • SEC</strong></p>
-        <p style="font-size: 10px; color: {COLORS['charcoal_light']}; margin: 10px 0 0 0;">Updated: {datetime.now().strftime('%Y-%m-%d')}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(
+        HTML['sidebar_sources'].format(updated=datetime.now().strftime('%Y-%m-%d')),
+        unsafe_allow_html=True
+    )
 
 # Apply filters
-filtered_df = df[
-    (df['strategic_score'] >= score_range[0]) &
-    (df['strategic_score'] <= score_range[1]) &
-    (df['ownership_type'].isin(ownership_filter)) &
-    (df['uranium_status'].isin(uranium_filter)) &
-    (df['status'].isin(status_filter))
-]
+filter_key = (
+    tuple(score_range),
+    tuple(sorted(ownership_filter)),
+    tuple(sorted(uranium_filter)),
+    tuple(sorted(status_filter)),
+)
+filtered_df = filter_deposits(filter_key)
 
 # ============================================================================
 # HEADER
 # ============================================================================
 
+# Aggregates shared by the header and KPI strip, computed once from the already-filtered arrays
+n_filtered = len(filtered_df)
+if n_filtered:
+    western_pct = (~filtered_df['_chinese_exposed'].to_numpy()).mean() * 100
+    total_resource = filtered_df['resource_mt'].to_numpy().sum()
+    total_treo = filtered_df['contained_treo_kt'].to_numpy().sum()
+    avg_heavy = filtered_df['heavy_ree_pct'].to_numpy().mean()
+    blocked_pct = filtered_df['_u_blocked'].to_numpy().mean() * 100
+else:
+    western_pct = total_resource = total_treo = avg_heavy = blocked_pct = 0
+
 col_header1, col_header2 = st.columns([3, 1])
 
 with col_header1:
-    st.markdown(f"""
-    <div style="display: flex; align-items: center; gap: 12px; margin-bottom: 5px;">
-        <span style="background-color: {COLORS['periwinkle']}; color: white; padding: 4px 12px; border-radius: 12px; font-size: 10px; font-weight: bold; letter-spacing: 1px;">OPEN SOURCE INTELLIGENCE</span>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HTML['header_badge'], unsafe_allow_html=True)
     st.markdown("# 🌍 Greenland Rare Earth Intelligence")
     st.caption("Strategic mineral assessment for the Arctic's most contested resource frontier")
 
@@ -346,66 +1012,46 @@ with col_header2:
     st.markdown("")
     col_stat1, col_stat2 = st.columns(2)
     with col_stat1:
-        st.metric("Deposits", f"{len(filtered_df)}/{len(df)}")
+        st.metric("Deposits", f"{n_filtered}/{N_DEPOSITS}")
     with col_stat2:
-        western_pct = len(filtered_df[filtered_df['chinese_stake_pct']==0])/max(len(filtered_df),1)*100
         st.metric("Western", f"{western_pct:.0f}%")
 
 st.markdown("---")
 
 # ============================================================================
-# MAIN TABS
+# MAIN VIEWS - only the selected view runs (st.tabs would execute every body)
 # ============================================================================
 
-tab1, tab2, tab3, tab4 = st.tabs([
-    "📊 Overview", 
-    "🔬 Deposit Analysis", 
-    "🎯 Scenario Modeling",
-    "📋 Data Explorer"
-])
+VIEWS = ["📊 Overview", "🔬 Deposit Analysis", "🎯 Scenario Modeling", "📋 Data Explorer"]
+active_view = st.radio("View", options=VIEWS, horizontal=True, label_visibility='collapsed', key='active_view')
+
+# Widgets of views that are not rendered would be dropped from session state at the end of
+# the run; re-assigning their keys keeps the user's choices for when the view is shown again
+VIEW_WIDGET_KEYS = {
+    VIEWS[1]: ['selected_deposit', 'compare_deposit'],
+    VIEWS[2]: ['uranium_scenario', 'chinese_scenario', 'infra_boost', 'price_scenario'],
+    VIEWS[3]: ['display_columns', 'sort_col', 'sort_order'],
+}
+for view, widget_keys in VIEW_WIDGET_KEYS.items():
+    if view != active_view:
+        for widget_key in widget_keys:
+            if widget_key in st.session_state:
+                st.session_state[widget_key] = st.session_state[widget_key]
 
 # ============================================================================
 # TAB 1: OVERVIEW
 # ============================================================================
 
-with tab1:
+if active_view == VIEWS[0]:
     # KPI Strip
-    kpi1, kpi2, kpi3, kpi4, kpi5 = st.columns(5)
-    
-    with kpi1:
-        st.metric(
-            label="📍 Deposits",
-            value=len(filtered_df),
-            delta=f"of {len(df)} total"
-        )
-    
-    with kpi2:
-        total_resource = filtered_df['resource_mt'].sum()
-        st.metric(
-            label="⛏️ Total Resource",
-            value=f"{total_resource/1000:.1f}B Mt",
-        )
-    
-    with kpi3:
-        total_treo = filtered_df['contained_treo_kt'].sum()
-        st.metric(
-            label="💎 Contained TREO",
-            value=f"{total_treo/1000:.1f}M t",
-        )
-    
-    with kpi4:
-        avg_heavy = filtered_df['heavy_ree_pct'].mean()
-        st.metric(
-            label="🔋 Avg Heavy REE",
-            value=f"{avg_heavy:.1f}%",
-        )
-    
-    with kpi5:
-        blocked_pct = len(filtered_df[filtered_df['uranium_ppm'] > 100]) / max(len(filtered_df),1) * 100
-        st.metric(
-            label="☢️ Uranium Blocked",
-            value=f"{blocked_pct:.0f}%",
-        )
+    st.markdown(HTML['kpi_strip'].format(
+        deposits=n_filtered,
+        total=N_DEPOSITS,
+        resource=f"{total_resource/1000:.1f}B Mt",
+        treo=f"{total_treo/1000:.1f}M t",
+        heavy=f"{avg_heavy:.1f}%",
+        blocked=f"{blocked_pct:.0f}%",
+    ), unsafe_allow_html=True)
     
     st.markdown("")
     
@@ -416,87 +1062,13 @@ with tab1:
         st.markdown("#### 🗺️ Strategic Deposit Map")
         st.caption("Size = Resource | Color = Strategic Score | Click for details")
         
-        fig_map = px.scatter_mapbox(
-            filtered_df,
-            lat='latitude',
-            lon='longitude',
-            size='resource_mt',
-            color='strategic_score',
-            hover_name='deposit_name',
-            hover_data={
-                'latitude': False,
-                'longitude': False,
-                'resource_mt': ':.0f',
-                'strategic_score': ':.0f',
-                'heavy_ree_pct': ':.0f',
-                'owner': True,
-                'status': True,
-            },
-            color_continuous_scale=[
-                [0, COLORS['grey_300']],
-                [0.4, COLORS['periwinkle_light']],
-                [0.7, COLORS['periwinkle']],
-                [1, COLORS['periwinkle_dark']]
-            ],
-            size_max=50,
-            zoom=2.3,
-            center={'lat': 68, 'lon': -42},
-            mapbox_style='carto-positron',
-            height=500
-        )
-        
-        fig_map.update_layout(
-            margin={"r":0,"t":0,"l":0,"b":0},
-            coloraxis_colorbar_title_text="Score"
-        )
-        
-        st.plotly_chart(fig_map, use_container_width=True)
+        render_figure(build_map_fig(filter_key))
     
     with chart_col:
         st.markdown("#### 📊 Strategic Ranking")
         st.caption("Deposits ordered by strategic value score")
         
-        df_sorted = filtered_df.sort_values('strategic_score', ascending=True)
-        
-        # Color bars by score category
-        colors = []
-        for score in df_sorted['strategic_score']:
-            if score >= 70:
-                colors.append(COLORS['success'])
-            elif score >= 50:
-                colors.append(COLORS['periwinkle'])
-            else:
-                colors.append(COLORS['grey_300'])
-        
-        fig_ranking = go.Figure()
-        
-        fig_ranking.add_trace(go.Bar(
-            y=df_sorted['deposit_name'],
-            x=df_sorted['strategic_score'],
-            orientation='h',
-            marker_color=colors,
-            text=[f"{s:.0f}" for s in df_sorted['strategic_score']],
-            textposition='outside',
-            textfont=dict(size=11),
-            hovertemplate="<b>%{y}</b><br>Score: %{x:.1f}<br>Owner: %{customdata}<extra></extra>",
-            customdata=df_sorted['owner']
-        ))
-        
-        # Add threshold lines
-        fig_ranking.add_vline(x=50, line_dash="dash", line_color=COLORS['warning'], line_width=1)
-        fig_ranking.add_vline(x=70, line_dash="dash", line_color=COLORS['success'], line_width=1)
-        
-        fig_ranking.update_layout(
-            xaxis_title='Strategic Score',
-            xaxis_range=[0, 100],
-            yaxis_title='',
-            margin={"r":60,"t":10,"l":10,"b":40},
-            height=500,
-            plot_bgcolor='white',
-            xaxis=dict(gridcolor=COLORS['grey_200']),
-        )
-        
-        st.plotly_chart(fig_ranking, use_container_width=True)
+        render_figure(build_ranking_fig(filter_key))
     
     # Secondary charts
     st.markdown("---")
@@ -507,117 +1079,29 @@ with tab1:
         st.markdown("#### 💎 Resource Quality Matrix")
         st.caption("Positioning by size and grade | Bubble = Heavy REE content")
         
-        fig_matrix = px.scatter(
-            filtered_df,
-            x='resource_mt',
-            y='treo_grade_pct',
-            size='heavy_ree_pct',
-            color='ownership_type',
-            hover_name='deposit_name',
-            hover_data=['strategic_score', 'owner', 'status'],
-            color_discrete_map={
-                'Western Control': COLORS['periwinkle'],
-                'Chinese Exposure': COLORS['danger']
-            },
-            log_x=True,
-            size_max=45,
-            height=350
-        )
-        
-        # Add quadrant labels
-        fig_matrix.add_annotation(x=3.5, y=1.8, text="HIGH VALUE", showarrow=False, 
-                                  font=dict(size=10, color=COLORS['charcoal_light']))
-        fig_matrix.add_annotation(x=1.2, y=0.4, text="LOW VALUE", showarrow=False,
-                                  font=dict(size=10, color=COLORS['charcoal_light']))
-        
-        fig_matrix.update_layout(
-            xaxis_title='Resource (Mt, log scale)',
-            yaxis_title='Grade (% TREO)',
-            margin={"r":10,"t":10,"l":10,"b":40},
-            plot_bgcolor='white',
-            xaxis=dict(gridcolor=COLORS['grey_200']),
-            yaxis=dict(gridcolor=COLORS['grey_200']),
-            legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
-        )
-        
-        st.plotly_chart(fig_matrix, use_container_width=True)
+        render_figure(build_matrix_fig(filter_key))
     
     with sec2:
         st.markdown("#### 🏛️ Ownership Split")
         st.caption("By total resource volume")
         
-        western = filtered_df[filtered_df['chinese_stake_pct'] == 0]['resource_mt'].sum()
-        chinese = filtered_df[filtered_df['chinese_stake_pct'] > 0]['resource_mt'].sum()
-        
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=['Western Control', 'Chinese Exposure'],
-            values=[western, chinese],
-            hole=0.65,
-            marker_colors=[COLORS['periwinkle'], COLORS['danger']],
-            textinfo='percent',
-            textfont=dict(size=12),
-            hovertemplate="<b>%{label}</b><br>%{value:,.0f} Mt<br>%{percent}<extra></extra>"
-        )])
-        
-        fig_pie.add_annotation(
-            text=f"{western/(western+chinese+0.001)*100:.0f}%<br><span style='font-size:10px'>Western</span>",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=18, color=COLORS['charcoal'])
-        )
-        
-        fig_pie.update_layout(
-            margin={"r":10,"t":10,"l":10,"b":10},
-            height=350,
-            showlegend=True,
-            legend=dict(orientation='h', yanchor='bottom', y=-0.15, xanchor='center', x=0.5)
-        )
-        
-        st.plotly_chart(fig_pie, use_container_width=True)
+        render_figure(build_pie_fig(filter_key))
     
     with sec3:
         st.markdown("#### ☢️ Regulatory Risk")
         st.caption("2021 uranium ban impact")
         
-        status_counts = filtered_df['uranium_status'].value_counts()
-        
-        fig_uranium = go.Figure(data=[go.Bar(
-            x=status_counts.index,
-            y=status_counts.values,
-            marker_color=[COLORS['success'] if 'Clear' in x else COLORS['danger'] for x in status_counts.index],
-            text=status_counts.values,
-            textposition='outside',
-            textfont=dict(size=14),
-        )])
-        
-        fig_uranium.update_layout(
-            margin={"r":10,"t":10,"l":10,"b":40},
-            height=350,
-            yaxis_title='Deposits',
-            xaxis_title='',
-            plot_bgcolor='white',
-            yaxis=dict(gridcolor=COLORS['grey_200']),
-        )
-        
-        st.plotly_chart(fig_uranium, use_container_width=True)
+        render_figure(build_uranium_fig(filter_key), config=PLOTLY_CONFIG_STATIC)
     
     # Key Finding
     st.markdown("")
-    st.markdown(f"""
-    <div class="highlight-box">
-        <div style="font-size: 11px; font-weight: bold; color: {COLORS['periwinkle_dark']}; letter-spacing: 1px; margin-bottom: 8px;">KEY FINDING</div>
-        <p style="margin: 0; font-size: 15px; line-height: 1.6;">
-            <strong>Tanbreez</strong> (80/100) emerges as the most strategically valuable deposit for Western supply chain diversification. 
-            With 30% heavy REE content (highest globally), zero Chinese exposure, US corporate control via Critical Metals Corp (NASDAQ: CRML), 
-            and clear regulatory status, it represents the optimal balance of geological quality and geopolitical security.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HTML['key_finding'], unsafe_allow_html=True)
 
 # ============================================================================
 # TAB 2: DEPOSIT ANALYSIS
 # ============================================================================
 
-with tab2:
+if active_view == VIEWS[1]:
     st.markdown("### 🔬 Deep Dive Analysis")
     st.caption("Select a deposit for comprehensive five-lens assessment")
     
@@ -628,36 +1112,43 @@ with tab2:
         selected_deposit = st.selectbox(
             "Select Primary Deposit",
             options=filtered_df['deposit_name'].tolist(),
-            index=0
+            index=0,
+            key="selected_deposit"
         )
     
     with col_compare:
         compare_deposit = st.selectbox(
             "Compare With (Optional)",
             options=['None'] + [d for d in filtered_df['deposit_name'].tolist() if d != selected_deposit],
-            index=0
+            index=0,
+            key="compare_deposit"
         )
     
-    # Get selected deposit data
-    deposit_data = filtered_df[filtered_df['deposit_name'] == selected_deposit].iloc[0]
+    # Get selected deposit data from a name lookup rebuilt only when the filters change
+    if st.session_state.get('deposit_lookup_key') != filter_key:
+        st.session_state.deposit_lookup_key = filter_key
+        st.session_state.deposit_by_name = {
+            row.deposit_name: row for row in filtered_df.itertuples(index=False)
+        }
+    deposit_data = st.session_state.deposit_by_name[selected_deposit]
     
     st.markdown("---")
     
     # Deposit header
-    score = deposit_data['strategic_score']
+    score = deposit_data.strategic_score
     score_color = COLORS['success'] if score >= 70 else COLORS['periwinkle'] if score >= 50 else COLORS['danger']
     
     header1, header2, header3 = st.columns([2, 1, 1])
     
     with header1:
         st.markdown(f"## {selected_deposit}")
-        st.caption(f"Owner: {deposit_data['owner']} | Status: {deposit_data['status']}")
+        st.caption(f"Owner: {deposit_data.owner} | Status: {deposit_data.status}")
     
     with header2:
         st.metric("Strategic Score", f"{score:.0f}/100")
     
     with header3:
-        st.metric("Ownership Risk", "Low" if deposit_data['chinese_stake_pct'] == 0 else f"{deposit_data['chinese_stake_pct']:.1f}% Chinese")
+        st.metric("Ownership Risk", "Low" if deposit_data.chinese_stake_pct == 0 else f"{deposit_data.chinese_stake_pct:.1f}% Chinese")
     
     # Five-lens radar chart
     radar_col, details_col = st.columns([1, 1])
@@ -665,89 +1156,16 @@ with tab2:
     with radar_col:
         st.markdown("#### 🎯 Five-Lens Assessment")
         
-        categories = ['Geological', 'Regulatory', 'Ownership', 'Infrastructure', 'Geopolitical']
-        
-        fig_radar = go.Figure()
-        
-        # Primary deposit
-        values_primary = [
-            deposit_data['geological_score'],
-            deposit_data['regulatory_score'],
-            deposit_data['ownership_score'],
-            deposit_data['infrastructure_score'],
-            deposit_data['geopolitical_score']
-        ]
-        values_primary.append(values_primary[0])  # Close the polygon
-        
-        fig_radar.add_trace(go.Scatterpolar(
-            r=values_primary,
-            theta=categories + [categories[0]],
-            fill='toself',
-            fillcolor=f"rgba(142, 159, 213, 0.3)",
-            line_color=COLORS['periwinkle'],
-            name=selected_deposit
-        ))
-        
-        # Comparison deposit
-        if compare_deposit != 'None':
-            compare_data = filtered_df[filtered_df['deposit_name'] == compare_deposit].iloc[0]
-            values_compare = [
-                compare_data['geological_score'],
-                compare_data['regulatory_score'],
-                compare_data['ownership_score'],
-                compare_data['infrastructure_score'],
-                compare_data['geopolitical_score']
-            ]
-            values_compare.append(values_compare[0])
-            
-            fig_radar.add_trace(go.Scatterpolar(
-                r=values_compare,
-                theta=categories + [categories[0]],
-                fill='toself',
-                fillcolor=f"rgba(220, 53, 69, 0.2)",
-                line_color=COLORS['danger'],
-                name=compare_deposit
-            ))
-        
-        fig_radar.update_layout(
-            polar=dict(
-                radialaxis=dict(visible=True, range=[0, 100], tickfont=dict(size=9)),
-                angularaxis=dict(tickfont=dict(size=11))
-            ),
-            showlegend=True if compare_deposit != 'None' else False,
-            margin={"r":30,"t":30,"l":30,"b":30},
-            height=400
-        )
-        
-        st.plotly_chart(fig_radar, use_container_width=True)
+        lens_matrix, name_to_row = lens_index()
+        # Plain int tuples keep the radar cache key value-based
+        primary_scores = tuple(lens_matrix[name_to_row[selected_deposit]].tolist())
+        compare_scores = tuple(lens_matrix[name_to_row[compare_deposit]].tolist()) if compare_deposit != 'None' else None
+        render_figure(build_radar_fig(selected_deposit, primary_scores, compare_deposit, compare_scores))
     
     with details_col:
         st.markdown("#### 📋 Deposit Specifications")
         
-        specs_df = pd.DataFrame({
-            'Metric': [
-                'Resource Estimate',
-                'TREO Grade',
-                'Heavy REE Content',
-                'Contained TREO',
-                'Contained Heavy REE',
-                'Uranium Content',
-                'Ice-Free Season',
-                'Port Distance',
-                'Discovery Year'
-            ],
-            'Value': [
-                f"{deposit_data['resource_mt']:,.0f} Mt",
-                f"{deposit_data['treo_grade_pct']:.2f}%",
-                f"{deposit_data['heavy_ree_pct']:.0f}%",
-                f"{deposit_data['contained_treo_kt']:,.0f} kt",
-                f"{deposit_data['contained_hree_kt']:,.0f} kt",
-                f"{deposit_data['uranium_ppm']:.0f} ppm {'⚠️' if deposit_data['uranium_ppm'] > 100 else '✅'}",
-                f"{deposit_data['ice_free_months']} months",
-                f"{deposit_data['port_distance_km']} km",
-                str(deposit_data['discovery_year'])
-            ]
-        })
+        specs_df = build_specs_table(tuple(getattr(deposit_data, field) for field in SPEC_FIELDS))
         
         st.dataframe(specs_df, use_container_width=True, hide_index=True, height=380)
     
@@ -758,11 +1176,11 @@ with tab2:
     score_cols = st.columns(5)
     
     lens_data = [
-        ('🏔️ Geological', deposit_data['geological_score'], 'Resource quality, grade, mineralogy'),
-        ('⚖️ Regulatory', deposit_data['regulatory_score'], 'Permits, uranium ban, compliance'),
-        ('🏛️ Ownership', deposit_data['ownership_score'], 'Western control, Chinese exposure'),
-        ('🚢 Infrastructure', deposit_data['infrastructure_score'], 'Port access, power, logistics'),
-        ('🌐 Geopolitical', deposit_data['geopolitical_score'], 'Strategic alignment, policy support'),
+        ('🏔️ Geological', deposit_data.geological_score, 'Resource quality, grade, mineralogy'),
+        ('⚖️ Regulatory', deposit_data.regulatory_score, 'Permits, uranium ban, compliance'),
+        ('🏛️ Ownership', deposit_data.ownership_score, 'Western control, Chinese exposure'),
+        ('🚢 Infrastructure', deposit_data.infrastructure_score, 'Port access, power, logistics'),
+        ('🌐 Geopolitical', deposit_data.geopolitical_score, 'Strategic alignment, policy support'),
     ]
     
     for i, (label, score, desc) in enumerate(lens_data):
@@ -780,7 +1198,9 @@ with tab2:
 # TAB 3: SCENARIO MODELING
 # ============================================================================
 
-with tab3:
+@st.fragment
+def render_scenario_tab(filter_key, filtered_df):
+    """Scenario controls and impact; widget changes rerun only this fragment"""
     st.markdown("### 🎯 Scenario Modeling")
     st.caption("Explore how policy changes and market conditions affect strategic assessments")
     
@@ -793,14 +1213,16 @@ with tab3:
         uranium_scenario = st.radio(
             "☢️ Greenland Uranium Ban (2021)",
             options=['Current (Ban Active)', 'Ban Lifted', 'Stricter Limits (50 ppm)'],
-            index=0
+            index=0,
+            key="uranium_scenario"
         )
         
         # Chinese investment scenario
         chinese_scenario = st.radio(
             "🇨🇳 Chinese Investment Policy",
             options=['Current Restrictions', 'Complete Ban', 'Restrictions Relaxed'],
-            index=0
+            index=0,
+            key="chinese_scenario"
         )
         
         # Infrastructure investment
@@ -809,137 +1231,83 @@ with tab3:
             min_value=0.0,
             max_value=10.0,
             value=0.0,
-            step=0.5
+            step=0.5,
+            key="infra_boost"
         )
         
         # REE price scenario
         price_scenario = st.select_slider(
             "💰 REE Price Environment",
             options=['Collapse (-50%)', 'Decline (-25%)', 'Stable', 'Rally (+25%)', 'Spike (+100%)'],
-            value='Stable'
+            value='Stable',
+            key="price_scenario"
         )
     
     with scenario_col2:
         st.markdown("#### 📈 Scenario Impact")
         
         # Calculate scenario adjustments
-        scenario_df = filtered_df.copy()
-        
-        # Uranium ban impact
-        if uranium_scenario == 'Ban Lifted':
-            scenario_df.loc[scenario_df['uranium_ppm'] > 100, 'regulatory_score'] += 40
-            scenario_df.loc[scenario_df['uranium_ppm'] > 100, 'strategic_score'] += 15
-        elif uranium_scenario == 'Stricter Limits (50 ppm)':
-            scenario_df.loc[scenario_df['uranium_ppm'] > 50, 'regulatory_score'] -= 30
-            scenario_df.loc[scenario_df['uranium_ppm'] > 50, 'strategic_score'] -= 10
-        
-        # Chinese investment impact
-        if chinese_scenario == 'Complete Ban':
-            scenario_df.loc[scenario_df['chinese_stake_pct'] > 0, 'ownership_score'] -= 20
-            scenario_df.loc[scenario_df['chinese_stake_pct'] > 0, 'strategic_score'] -= 8
-        elif chinese_scenario == 'Restrictions Relaxed':
-            scenario_df['geopolitical_score'] -= 10
-        
-        # Infrastructure boost
-        if infra_boost > 0:
-            infra_impact = min(infra_boost * 3, 20)
-            scenario_df['infrastructure_score'] += infra_impact
-            scenario_df['strategic_score'] += infra_impact * 0.15
-        
-        # Cap scores at 100
-        for col in ['regulatory_score', 'ownership_score', 'infrastructure_score', 'geopolitical_score', 'strategic_score']:
-            scenario_df[col] = scenario_df[col].clip(0, 100)
+        scenario_df = compute_scenario(filter_key, uranium_scenario, chinese_scenario, infra_boost)
         
         # Show top movers
-        scenario_df['score_change'] = scenario_df['strategic_score'] - filtered_df['strategic_score']
-        
         movers = scenario_df[['deposit_name', 'strategic_score', 'score_change']].sort_values('score_change', ascending=False)
         
         st.markdown("**Top Score Changes:**")
         
-        for _, row in movers.head(5).iterrows():
-            change = row['score_change']
-            arrow = "🔺" if change > 0 else "🔻" if change < 0 else "➡️"
-            color = COLORS['success'] if change > 0 else COLORS['danger'] if change < 0 else COLORS['charcoal_light']
-            st.markdown(f"{arrow} **{row['deposit_name']}**: {row['strategic_score']:.0f} ({change:+.1f})")
+        top5 = movers.head(5)
+        change = top5['score_change'].to_numpy()
+        arrows = np.select([change > 0, change < 0], ["🔺", "🔻"], "➡️")
+        st.markdown("\n\n".join(
+            f"{arrow} **{name}**: {score:.0f} ({delta:+.1f})"
+            for arrow, name, score, delta in zip(arrows, top5['deposit_name'], top5['strategic_score'], change)
+        ))
     
     st.markdown("---")
     
     # Scenario comparison chart
     st.markdown("#### 📊 Baseline vs Scenario Comparison")
     
-    comparison_df = pd.DataFrame({
-        'Deposit': filtered_df['deposit_name'],
-        'Baseline': filtered_df['strategic_score'],
-        'Scenario': scenario_df['strategic_score']
-    }).sort_values('Baseline', ascending=True)
-    
-    fig_scenario = go.Figure()
-    
-    fig_scenario.add_trace(go.Bar(
-        y=comparison_df['Deposit'],
-        x=comparison_df['Baseline'],
-        orientation='h',
-        name='Baseline',
-        marker_color=COLORS['grey_300'],
-    ))
-    
-    fig_scenario.add_trace(go.Bar(
-        y=comparison_df['Deposit'],
-        x=comparison_df['Scenario'],
-        orientation='h',
-        name='Scenario',
-        marker_color=COLORS['periwinkle'],
-    ))
-    
-    fig_scenario.update_layout(
-        barmode='group',
-        xaxis_title='Strategic Score',
-        xaxis_range=[0, 100],
-        yaxis_title='',
-        margin={"r":20,"t":10,"l":10,"b":40},
-        height=450,
-        plot_bgcolor='white',
-        legend=dict(orientation='h', yanchor='bottom', y=1.02, xanchor='right', x=1)
-    )
-    
-    st.plotly_chart(fig_scenario, use_container_width=True)
+    render_figure(build_scenario_fig(filter_key, uranium_scenario, chinese_scenario, infra_boost))
     
     # Scenario summary
-    baseline_leader = filtered_df.loc[filtered_df['strategic_score'].idxmax(), 'deposit_name']
-    scenario_leader = scenario_df.loc[scenario_df['strategic_score'].idxmax(), 'deposit_name']
+    names = filtered_df['deposit_name'].to_numpy()
+    baseline_leader = names[filtered_df['strategic_score'].to_numpy().argmax()]
+    scenario_leader = names[scenario_df['strategic_score'].to_numpy().argmax()]
     
     if baseline_leader != scenario_leader:
         st.warning(f"⚠️ **Leadership Change:** Under this scenario, **{scenario_leader}** overtakes **{baseline_leader}** as the top-ranked deposit.")
     else:
         st.success(f"✅ **{baseline_leader}** remains the top-ranked deposit under this scenario.")
 
+if active_view == VIEWS[2]:
+    render_scenario_tab(filter_key, filtered_df)
+
 # ============================================================================
 # TAB 4: DATA EXPLORER
 # ============================================================================
 
-with tab4:
+@st.fragment
+def render_explorer_tab(filter_key, filtered_df):
+    """Column picker, sorted table and summary stats; reruns on its own"""
     st.markdown("### 📋 Data Explorer")
     st.caption("Full dataset with sorting and filtering capabilities")
     
     # Column selector
-    all_columns = filtered_df.columns.tolist()
+    all_columns = [col for col in filtered_df.columns if not col.startswith('_')]
     display_columns = st.multiselect(
         "Select columns to display",
         options=all_columns,
         default=['deposit_name', 'strategic_score', 'resource_mt', 'treo_grade_pct', 
-                'heavy_ree_pct', 'owner', 'chinese_stake_pct', 'status', 'uranium_ppm']
+                'heavy_ree_pct', 'owner', 'chinese_stake_pct', 'status', 'uranium_ppm'],
+        key="display_columns"
     )
     
     if display_columns:
         # Sortable dataframe
-        sort_col = st.selectbox("Sort by", options=display_columns, index=1)
-        sort_order = st.radio("Order", options=['Descending', 'Ascending'], horizontal=True)
+        sort_col = st.selectbox("Sort by", options=display_columns, index=1, key="sort_col")
+        sort_order = st.radio("Order", options=['Descending', 'Ascending'], horizontal=True, key="sort_order")
         
-        display_df = filtered_df[display_columns].sort_values(
-            sort_col, 
-            ascending=(sort_order == 'Ascending')
-        ).reset_index(drop=True)
+        display_df = build_display_table(filter_key, tuple(display_columns), sort_col, sort_order == 'Ascending')
         
         st.dataframe(
             display_df,
@@ -956,8 +1324,10 @@ with tab4:
         summary_cols = [c for c in numeric_cols if c in display_columns]
         
         if summary_cols:
-            summary_df = filtered_df[summary_cols].describe().round(2)
-            st.dataframe(summary_df, use_container_width=True)
+            st.dataframe(build_summary_table(filter_key, tuple(summary_cols)), use_container_width=True)
+
+if active_view == VIEWS[3]:
+    render_explorer_tab(filter_key, filtered_df)
 
 # ============================================================================
 # FOOTER